@@ -1,13 +1,13 @@
 from quart import Quart, request, jsonify
 from telegram import Update, Bot
-from telegram.ext import Application
+from telegram.ext import AIORateLimiter, Application
 from telegram.request import HTTPXRequest
 import logging
 import os
 import asyncio
 from functools import wraps
 from handlers.setup import setup_application
-from config import BOT_TOKEN
+from config import BOT_TOKEN, TELEGRAM_MAX_RETRIES, CONCURRENT_UPDATES
 
 # Logging configuration
 logging.basicConfig(
@@ -30,6 +30,8 @@ REQUEST_KWARGS = {
     "read_timeout": 20.0,
     "write_timeout": 20.0,
     "pool_timeout": 3.0,
+    # Multiplex concurrent Bot API calls over one TLS connection
+    "http_version": "2",
 }
 
 async def initialize() -> None:
@@ -40,26 +42,25 @@ async def initialize() -> None:
             # Configure custom request parameters
             request = HTTPXRequest(**REQUEST_KWARGS)
 
-            # Initialize bot with custom request parameters
-            bot = Bot(token=BOT_TOKEN, request=request)
-            await bot.initialize()
-            
-            # Create and initialize application
+            # Create and initialize application; outgoing calls are throttled
+            # to Telegram's flood limits by the application's own bot
             application = (
                 Application.builder()
                 .token(BOT_TOKEN)
                 .request(request)
+                .rate_limiter(AIORateLimiter(max_retries=TELEGRAM_MAX_RETRIES))
+                .concurrent_updates(CONCURRENT_UPDATES)
                 .build()
             )
             await application.initialize()
-            application.bot = bot
+            bot = application.bot
             
             # Setup handlers
             await setup_application(application)
             
             logger.info("Bot and application initialized successfully")
         except Exception as e:
-            logger.error(f"Error during initialization: {str(e)}", exc_info=True)
+            logger.error("Error during initialization: %s", e, exc_info=True)
             raise
 
 def ensure_initialized(f):
@@ -88,7 +89,7 @@ async def home():
             "application_initialized": application is not None
         })
     except Exception as e:
-        logger.error(f"Error in health check: {str(e)}", exc_info=True)
+        logger.error("Error in health check: %s", e, exc_info=True)
         return jsonify({"status": "error", "message": str(e)}), 500
 
 @app.route('/webhook', methods=['POST'])
@@ -101,7 +102,7 @@ async def webhook():
             json_data = await request.get_json()
             
             # Log the incoming update
-            logger.info(f"Received update: {json_data}")
+            logger.debug("Received update: %s", json_data)
             
             # Ensure bot is initialized
             if bot is None or application is None:
@@ -114,7 +115,7 @@ async def webhook():
             return jsonify({"status": "ok"})
             
         except Exception as e:
-            logger.error(f"Error processing update: {str(e)}", exc_info=True)
+            logger.error("Error processing update: %s", e, exc_info=True)
             return jsonify({
                 "status": "error",
                 "message": str(e),
@@ -126,7 +127,7 @@ async def webhook():
 @app.errorhandler(Exception)
 async def handle_exception(e):
     """Handle any unhandled exceptions"""
-    logger.error(f"Unhandled exception: {str(e)}", exc_info=True)
+    logger.error("Unhandled exception: %s", e, exc_info=True)
     return jsonify({
         "status": "error",
         "message": "An internal error occurred",
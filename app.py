@@ -1,9 +1,8 @@
 import logging
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
-from config import BOT_TOKEN
-from handlers.admin_handlers import liste_questions, tag_all, offremploi
-# from handlers.user_handlers import start, ask_question, send_cv, my_id
-from handlers.message_handlers import welcome_new_member, handle_message
+from telegram import Update
+from telegram.ext import AIORateLimiter, Application
+from config import BOT_TOKEN, TELEGRAM_MAX_RETRIES, CONCURRENT_UPDATES
+from handlers.setup import setup_application
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -13,25 +12,22 @@ logger = logging.getLogger(__name__)
 
 def main() -> None:
     try:
-        application = Application.builder().token(BOT_TOKEN).build()
-
-        # Add handlers
-        application.add_handler(CommandHandler("start", start))
-        # application.add_handler(CommandHandler("question", ask_question))
-        # application.add_handler(CommandHandler("liste_questions", liste_questions))
-        application.add_handler(CommandHandler("sendcv", send_cv))
-        application.add_handler(CommandHandler("myid", my_id))
-        
-        application.add_handler(CommandHandler("tagall", tag_all))
-        application.add_handler(CommandHandler("offremploi", offremploi))
-        application.add_handler(MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, welcome_new_member))
-        application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
+        # Handlers are registered once, by the same setup used for the webhook
+        application = (
+            Application.builder()
+            .token(BOT_TOKEN)
+            .http_version("2")
+            .rate_limiter(AIORateLimiter(max_retries=TELEGRAM_MAX_RETRIES))
+            .concurrent_updates(CONCURRENT_UPDATES)
+            .post_init(setup_application)
+            .build()
+        )
 
         # Start the bot in polling mode
         application.run_polling(allowed_updates=Update.ALL_TYPES)
         logger.info("Bot started successfully in polling mode")
     except Exception as e:
-        logger.error(f"Error starting bot: {str(e)}")
+        logger.error("Error starting bot: %s", e, exc_info=True)
 
 if __name__ == '__main__':
     main()
@@ -2,19 +2,21 @@ import logging
 from telegram import Update
 from telegram.ext import ContextTypes
 from utils.decorators import admin_only
+from utils.message_utils import pack_messages, split_message
 from utils.file_utils import load_questions, save_questions, load_scraped_data
 
 logger = logging.getLogger(__name__)
 
 @admin_only
 async def liste_questions(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    questions, _ = load_questions()
+    questions, _ = await load_questions()
     if not context.args:
         unanswered_questions = [f'❓ ID: {qid}, Question: {q["question"]}' for qid, q in questions.items() if not q['answered']]
         if not unanswered_questions:
             await update.message.reply_text('🟢 Aucune question non répondue.')
         else:
-            await update.message.reply_text('\n'.join(unanswered_questions))
+            for text in pack_messages(unanswered_questions):
+                await update.message.reply_text(text)
     else:
         question_id = context.args[0]
         answer_text = ' '.join(context.args[1:])
@@ -25,7 +27,7 @@ async def liste_questions(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
         questions[question_id]['answer'] = answer_text
         questions[question_id]['answered'] = True
-        save_questions(questions)
+        await save_questions(questions)
 
         await update.message.reply_text(f'✅ La question ID {question_id} a été répondue. ✍️')
 
@@ -63,15 +65,16 @@ async def offremploi(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
     await update.message.reply_text('Fetching job offers, please wait...')
 
     try:
-        data = load_scraped_data()
+        data = await load_scraped_data()
         
         if not data:
             await update.message.reply_text('No job offers found.')
         else:
             for index, text in enumerate(data):
                 message = f'Job Offer {index + 1}: {text}\n\n🔵 Les candidats intéressés, envoyez vos candidatures à l\'adresse suivante :\n📩 : candidat@triemploi.com'
-                await update.message.reply_text(message)
+                for piece in split_message(message):
+                    await update.message.reply_text(piece)
 
     except Exception as e:
-        logger.error(f'Unexpected error in offremploi: {e}')
+        logger.error('Unexpected error in offremploi: %s', e)
         await update.message.reply_text('❌ An unexpected error occurred. Please try again later.')
\ No newline at end of file
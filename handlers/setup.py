@@ -1,8 +1,11 @@
+import logging
 from telegram.ext import CommandHandler, MessageHandler, filters
 from .user_handlers import start, send_cv, my_id
 from .admin_handlers import liste_questions, tag_all, offremploi
 from .message_handlers import welcome_new_member, handle_message
 
+logger = logging.getLogger(__name__)
+
 async def setup_application(app):
     """
     Setup all handlers for the application
@@ -41,5 +44,5 @@ async def setup_application(app):
         
     except Exception as e:
         # Log any errors during setup
-        logging.error(f"Error setting up application handlers: {str(e)}", exc_info=True)
+        logger.error("Error setting up application handlers: %s", e, exc_info=True)
         raise
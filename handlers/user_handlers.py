@@ -3,74 +3,79 @@ import re
 from telegram import Update
 from telegram.ext import ContextTypes
 from utils.email_utils import send_email_with_cv
-from config import ADMIN_USER_IDS
-import asyncio
+from utils.decorators import handle_errors, per_user_serialized
+from config import CV_TYPES
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+# Separators users put between the email and the CV type ("email, junior")
+_ARG_SEPARATORS = ',;:|'
+_ARG_SPLIT_RE = re.compile(f'[{re.escape(_ARG_SEPARATORS)}]+')
+
+_START_TEXT = (
+    '👋 Bonjour ! Voici les commandes disponibles :\n\n'
+    '/sendcv - Recevoir un CV\n'
+    '/myid - Voir votre ID'
+)
+
+_USAGE_TEXT = (
+    '❌ Format: /sendcv [email] [junior|senior]\n'
+    'Exemple: /sendcv email@example.com junior'
+)
+
+def is_valid_email(email: str) -> bool:
+    """Check that the whole string is a plausible email address"""
+    return _EMAIL_RE.fullmatch(email) is not None
+
+@handle_errors("Error sending start message")
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle the /start command"""
-    logger.info(f"Start command received from user {update.effective_user.id}")
-    try:
-        await update.message.reply_text(
-            '👋 Bonjour ! Voici les commandes disponibles :\n\n'
-            '/sendcv - Recevoir un CV\n'
-            '/myid - Voir votre ID'
-        )
-    except Exception as e:
-        logger.error(f"Error sending start message: {str(e)}", exc_info=True)
-        await handle_error_with_retry(update, "Error sending start message")
+    logger.info("Start command received from user %s", update.effective_user.id)
+    await update.message.reply_text(_START_TEXT)
 
+@handle_errors("Une erreur est survenue lors de l'envoi du CV")
+@per_user_serialized
 async def send_cv(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle the /sendcv command"""
-    try:
-        if not context.args or len(context.args) != 2:
-            await update.message.reply_text(
-                '❌ Format: /sendcv [email] [junior|senior]\n'
-                'Exemple: /sendcv email@example.com junior'
-            )
-            return
+    # "email,junior", "email ,junior" and "email, junior," all come down to
+    # the same two pieces once separators are split off and empties dropped
+    args = [
+        piece
+        for arg in context.args or ()
+        for piece in _ARG_SPLIT_RE.split(arg)
+        if piece
+    ]
 
-        email = context.args[0].lower()
-        cv_type = context.args[1].lower()
+    try:
+        email, cv_type = args
+    except ValueError:
+        await update.message.reply_text(_USAGE_TEXT)
+        return
 
-        # Validate email format
-        if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-            await update.message.reply_text('❌ Format d\'email invalide.')
-            return
+    email = email.lower()
+    if cv_type not in CV_TYPES:
+        cv_type = cv_type.lower()
 
-        # Validate CV type
-        if cv_type not in ['junior', 'senior']:
-            await update.message.reply_text(
-                '❌ Type de CV invalide. Utilisez "junior" ou "senior".'
-            )
-            return
+    # Validate email format
+    if not is_valid_email(email):
+        await update.message.reply_text('❌ Format d\'email invalide.')
+        return
 
-        result = await send_email_with_cv(email, cv_type, update.effective_user.id, context)
-        await update.message.reply_text(result)
+    # Validate CV type
+    if cv_type not in CV_TYPES:
+        await update.message.reply_text(
+            '❌ Type de CV invalide. Utilisez "junior" ou "senior".'
+        )
+        return
 
-    except Exception as e:
-        logger.error(f"Error in send_cv: {str(e)}", exc_info=True)
-        await handle_error_with_retry(update, "Une erreur est survenue lors de l'envoi du CV")
+    result = await send_email_with_cv(email, cv_type, update.effective_user.id, context)
+    await update.message.reply_text(result)
 
+@handle_errors("Error retrieving ID")
 async def my_id(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle the /myid command"""
-    try:
-        user_id = update.effective_user.id
-        await update.message.reply_text(f'🔍 Votre ID est : {user_id}')
-    except Exception as e:
-        logger.error(f"Error in my_id: {str(e)}", exc_info=True)
-        await handle_error_with_retry(update, "Error retrieving ID")
-
-async def handle_error_with_retry(update: Update, message: str, max_retries: int = 3) -> None:
-    """Handle errors with retry logic"""
-    for attempt in range(max_retries):
-        try:
-            await update.message.reply_text(f'❌ {message}')
-            break
-        except Exception as e:
-            if attempt == max_retries - 1:
-                logger.error(f"Failed to send error message after {max_retries} attempts: {str(e)}", exc_info=True)
-            else:
-                await asyncio.sleep(1)  # Wait before retry
+    user_id = update.effective_user.id
+    await update.message.reply_text(f'🔍 Votre ID est : {user_id}')
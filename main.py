@@ -3,11 +3,11 @@ import logging
 import signal
 import os
 from datetime import datetime
-import re
 from typing import Dict, Any
 
 from telegram import Update
 from telegram.ext import (
+    AIORateLimiter,
     Application,
     CommandHandler,
     MessageHandler,
@@ -23,8 +23,12 @@ import motor.motor_asyncio
 from config import (
     BOT_TOKEN,
     MONGODB_URI,
-    ADMIN_USER_IDS,
+    TELEGRAM_MAX_RETRIES,
+    CONCURRENT_UPDATES,
 )
+from handlers.user_handlers import send_cv, my_id
+from utils.decorators import admin_only, handle_errors
+from utils.message_utils import pack_messages
 
 # Logging configuration
 logging.basicConfig(
@@ -36,7 +40,6 @@ logger = logging.getLogger(__name__)
 # Initialize MongoDB
 client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
 db = client.cvbot
-sent_emails_collection = db.sent_emails
 questions_collection = db.questions
 
 # Initialize the Dash app
@@ -56,82 +59,43 @@ config.workers = 1
 # Global control flag
 bot_running = True
 
-# Command Handlers
-async def send_cv(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle the /sendcv command"""
-    try:
-        if not context.args or len(context.args) != 2:
-            await update.message.reply_text(
-                '❌ Format: /sendcv [email] [junior|senior]\n'
-                'Exemple: /sendcv email@example.com junior'
-            )
-            return
-
-        email = context.args[0].lower()
-        cv_type = context.args[1].lower()
-
-        # Validate email format
-        if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-            await update.message.reply_text('❌ Format d\'email invalide.')
-            return
-
-        # Validate CV type
-        if cv_type not in ['junior', 'senior']:
-            await update.message.reply_text('❌ Type de CV invalide. Utilisez "junior" ou "senior".')
-            return
-
-        user_id = update.effective_user.id
-        is_admin = user_id in ADMIN_USER_IDS
-
-        # Check previous sends for non-admin users
-        if not is_admin:
-            # Check if email has already received a CV
-            email_record = await sent_emails_collection.find_one({"email": email})
-            if email_record:
-                await update.message.reply_text(
-                    f'📩 Cet email a déjà reçu un CV de type {email_record["cv_type"]}.'
-                )
-                return
-
-            # Check if user has already received a CV
-            user_record = await sent_emails_collection.find_one({"user_id": str(user_id)})
-            if user_record:
-                await update.message.reply_text(
-                    f'📩 Vous avez déjà reçu un CV de type {user_record["cv_type"]}.'
-                )
-                return
-
-        # Send email with CV
-        from utils.email_utils import send_email_with_cv
-        result = await send_email_with_cv(
-            email=email,
-            cv_type=cv_type,
-            user_id=user_id,
-            context=context
-        )
-        
-        await update.message.reply_text(result)
-
-    except Exception as e:
-        logger.error(f"Error in send_cv: {str(e)}", exc_info=True)
-        await update.message.reply_text('❌ Une erreur est survenue lors de l\'envoi du CV.')
-
 class CVBot:
+    # Static reply templates, built once with the class
+    START_TEXT = (
+        '👋 Bonjour ! Voici les commandes disponibles :\n\n'
+        '/question - Poser une question\n'
+        '/liste_questions - Voir et répondre aux questions (réservé aux administrateurs)\n'
+        '/sendcv - Recevoir un CV\n'
+        '/myid - Voir votre ID'
+    )
+    WELCOME_TEXT = (
+        "👋 Bienvenue {mention} !\n\n"
+        "Utilisez /start pour voir les commandes disponibles."
+    )
+    QUESTION_TEXT = "ID: {id}\nQuestion: {question}\nUser ID: {user_id}\n\n"
+
     def __init__(self, token: str):
         self.token = token
         self.application = None
         
     async def setup(self):
         """Initialize and setup the bot application"""
-        self.application = Application.builder().token(self.token).build()
+        self.application = (
+            Application.builder()
+            .token(self.token)
+            .http_version("2")
+            .rate_limiter(AIORateLimiter(max_retries=TELEGRAM_MAX_RETRIES))
+            .concurrent_updates(CONCURRENT_UPDATES)
+            .build()
+        )
         
         # Register command handlers
         handlers = [
             CommandHandler("start", self.start),
             CommandHandler("question", self.ask_question),
             CommandHandler("liste_questions", self.liste_questions),
-            CommandHandler("sendcv", send_cv),  # Using the standalone function
-            CommandHandler("myid", self.my_id),
+            CommandHandler("sendcv", send_cv),
+            CommandHandler("myid", my_id),
             CommandHandler("tagall", self.tag_all),
             CommandHandler("offremploi", self.offremploi),
             MessageHandler(filters.StatusUpdate.NEW_CHAT_MEMBERS, self.welcome_new_member),
@@ -158,20 +122,15 @@ class CVBot:
             await self.application.stop()
             await self.application.shutdown()
 
+    @handle_errors("Error sending start message")
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle the /start command"""
-        logger.info(f"Start command received from user {update.effective_user.id}")
-        try:
-            await update.message.reply_text(
-                '👋 Bonjour ! Voici les commandes disponibles :\n\n'
-                '/question - Poser une question\n'
-                '/liste_questions - Voir et répondre aux questions (réservé aux administrateurs)\n'
-                '/sendcv - Recevoir un CV\n'
-                '/myid - Voir votre ID'
-            )
-            logger.info("Start message sent successfully")
-        except Exception as e:
-            logger.error(f"Error sending start message: {str(e)}")
+        """Handle the /start command
+
+        CVBot also registers /question and /liste_questions, so it lists them
+        in its own help text instead of the shared handler's.
+        """
+        logger.info("Start command received from user %s", update.effective_user.id)
+        await update.message.reply_text(self.START_TEXT)
 
     async def ask_question(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /question command"""
@@ -193,60 +152,42 @@ class CVBot:
 
             await update.message.reply_text('✅ Votre question a été soumise et sera répondue par un administrateur. 🙏')
         except Exception as e:
-            logger.error(f"Error saving question: {str(e)}")
+            logger.error("Error saving question: %s", e, exc_info=True)
             await update.message.reply_text('❌ Une erreur est survenue lors de l\'enregistrement de votre question.')
 
+    @admin_only
     async def liste_questions(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /liste_questions command (admin only)"""
-        user_id = update.effective_user.id
-        if user_id not in ADMIN_USER_IDS:
-            await update.message.reply_text('❌ Cette commande est réservée aux administrateurs.')
-            return
-
         try:
             questions = await questions_collection.find({'answered': False}).to_list(length=None)
             if not questions:
                 await update.message.reply_text('📝 Aucune question en attente.')
                 return
 
-            response = "Questions en attente :\n\n"
-            for q in questions:
-                response += f"ID: {str(q['_id'])}\n"
-                response += f"Question: {q['question']}\n"
-                response += f"User ID: {q['user_id']}\n\n"
-
-            await update.message.reply_text(response)
+            parts = ["Questions en attente :\n\n"] + [
+                self.QUESTION_TEXT.format(id=q['_id'], question=q['question'], user_id=q['user_id'])
+                for q in questions
+            ]
+            for response in pack_messages(parts, separator=''):
+                await update.message.reply_text(response)
         except Exception as e:
-            logger.error(f"Error listing questions: {str(e)}")
+            logger.error("Error listing questions: %s", e, exc_info=True)
             await update.message.reply_text('❌ Une erreur est survenue lors de la récupération des questions.')
 
-    async def my_id(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle the /myid command"""
-        user_id = update.effective_user.id
-        await update.message.reply_text(f'🔍 Votre ID est : {user_id}')
-
+    @admin_only
     async def tag_all(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /tagall command (admin only)"""
-        user_id = update.effective_user.id
-        if user_id not in ADMIN_USER_IDS:
-            await update.message.reply_text('❌ Cette commande est réservée aux administrateurs.')
-            return
-
         try:
             chat_members = await context.bot.get_chat_administrators(update.effective_chat.id)
             member_list = [member.user.mention_html() for member in chat_members]
             await update.message.reply_html("🔔 " + " ".join(member_list))
         except Exception as e:
-            logger.error(f"Error in tag_all: {str(e)}")
+            logger.error("Error in tag_all: %s", e, exc_info=True)
             await update.message.reply_text('❌ Une erreur est survenue.')
 
+    @admin_only
     async def offremploi(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle the /offremploi command (admin only)"""
-        user_id = update.effective_user.id
-        if user_id not in ADMIN_USER_IDS:
-            await update.message.reply_text('❌ Cette commande est réservée aux administrateurs.')
-            return
-
         if not context.args:
             await update.message.reply_text('❗ Veuillez fournir le texte de l\'offre d\'emploi.')
             return
@@ -258,7 +199,7 @@ class CVBot:
                 parse_mode='HTML'
             )
         except Exception as e:
-            logger.error(f"Error in offremploi: {str(e)}")
+            logger.error("Error in offremploi: %s", e, exc_info=True)
             await update.message.reply_text('❌ Une erreur est survenue lors de la publication de l\'offre.')
 
     async def welcome_new_member(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -267,12 +208,11 @@ class CVBot:
             for member in update.message.new_chat_members:
                 if not member.is_bot:
                     await update.message.reply_text(
-                        f"👋 Bienvenue {member.mention_html()} !\n\n"
-                        "Utilisez /start pour voir les commandes disponibles.",
+                        self.WELCOME_TEXT.format(mention=member.mention_html()),
                         parse_mode='HTML'
                     )
         except Exception as e:
-            logger.error(f"Error in welcome_new_member: {str(e)}")
+            logger.error("Error in welcome_new_member: %s", e, exc_info=True)
 
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle regular messages"""
@@ -307,7 +247,7 @@ async def run_telegram_bot(bot_token: str):
         await bot.shutdown()
         
     except Exception as e:
-        logger.error(f"Bot error: {str(e)}", exc_info=True)
+        logger.error("Bot error: %s", e, exc_info=True)
         await bot.shutdown()
 
 async def main():
@@ -323,7 +263,7 @@ async def main():
     try:
         await asyncio.gather(dash_task, telegram_task)
     except Exception as e:
-        logger.error(f"Main loop error: {str(e)}", exc_info=True)
+        logger.error("Main loop error: %s", e, exc_info=True)
     finally:
         global bot_running
         bot_running = False
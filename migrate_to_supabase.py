@@ -1,13 +1,14 @@
 from postgrest.exceptions import APIError
-import json
 from config import QUESTIONS_JSON_FILE, SENT_EMAILS_JSON_FILE, SCRAPED_DATA_FILE
 from config import QUESTIONS_TABLE, SENT_EMAILS_TABLE, SCRAPED_DATA_TABLE
 from utils.file_utils import check_supabase_connection
+import ijson
 
 def migrate_json_to_supabase(file_path, table_name):
-    with open(file_path, 'r') as file:
-        data = json.load(file)
-        for key, value in data.items():
+    with open(file_path, 'rb') as file:
+        # Decode the object one entry at a time so peak memory stays bounded by
+        # the largest record; floats rather than Decimals keep rows serializable
+        for key, value in ijson.kvitems(file, '', use_float=True):
             item = value if isinstance(value, dict) else {"email": key, "status": value}
 
             if table_name == QUESTIONS_TABLE:
@@ -2,26 +2,87 @@
 
 import os
 import uuid
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 from datetime import datetime
-from supabase import create_client, Client
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Handlers and levels are configured by the entry points (app.py, main.py, api/index.py)
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 # Load environment variables
 load_dotenv()
 
+# HTTP pool for PostgREST requests issued from execute_query's worker threads
+POSTGREST_MAX_CONNECTIONS = 20
+POSTGREST_KEEPALIVE_EXPIRY = 60  # seconds an idle connection stays open
+
+def _use_keepalive_session(client: "Client") -> None:
+    """Swap the PostgREST session for a pooled HTTP/2 one
+
+    Requests then share a few long-lived TLS connections to Supabase
+    instead of negotiating new ones whenever the pool runs dry. The new
+    session is postgrest's own SyncClient and keeps every setting of the
+    one it replaces; only the pool limits and HTTP/2 are added.
+    """
+    import httpx
+    from postgrest.utils import SyncClient
+
+    postgrest = client.postgrest
+    session = postgrest.session
+    options = {}
+    # Newer postgrest releases keep their proxy and TLS settings on the client
+    proxy = getattr(postgrest, 'proxy', None)
+    if proxy is not None:
+        options['proxy'] = proxy
+    postgrest.session = SyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=session.timeout,
+        verify=getattr(postgrest, 'verify', True),
+        follow_redirects=session.follow_redirects,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=POSTGREST_MAX_CONNECTIONS,
+            max_keepalive_connections=POSTGREST_MAX_CONNECTIONS,
+            keepalive_expiry=POSTGREST_KEEPALIVE_EXPIRY,
+        ),
+        **options,
+    )
+    session.close()
+
+async def execute_query(query):
+    """Run a supabase-py query in a worker thread
+
+    The client is synchronous, so executing a query inline would block the
+    event loop for the whole HTTP round trip.
+    """
+    return await asyncio.to_thread(query.execute)
+
 class SupabaseManager:
     def __init__(self):
         self.url: str = os.environ.get("SUPABASE_URL")
         self.key: str = os.environ.get("SUPABASE_KEY")
         if not self.url or not self.key:
             raise ValueError("Missing Supabase credentials in environment variables")
-        self.client: Client = create_client(self.url, self.key)
+        self._client: Optional["Client"] = None
+
+    @property
+    def client(self) -> "Client":
+        """Supabase client, created on first use"""
+        if self._client is None:
+            # supabase pulls in postgrest, gotrue, storage and realtime; importing
+            # it here keeps all of that off the process start-up path
+            from supabase import create_client
+            client = create_client(self.url, self.key)
+            _use_keepalive_session(client)
+            self._client = client
+        return self._client
 
     async def initialize_tables(self):
         """Initialize all required tables if they don't exist"""
@@ -68,7 +129,7 @@ class SupabaseManager:
             logger.info("Database tables initialized successfully")
             
         except Exception as e:
-            logger.error(f"Error initializing tables: {str(e)}")
+            logger.error("Error initializing tables: %s", e)
             raise
 
     async def insert_sent_email(self, user_id: str, email: str, cv_type: str) -> Dict[str, Any]:
@@ -84,34 +145,36 @@ class SupabaseManager:
             Dict[str, Any]: Inserted record
         """
         try:
+            now = datetime.utcnow().isoformat()
             data = {
                 "user_id": user_id,
                 "email": email,
                 "status": "sent",  # Status is explicitly set here
                 "cv_type": cv_type,
-                "sent_at": datetime.utcnow().isoformat(),  # Set sent_at when inserting
-                "created_at": datetime.utcnow().isoformat()
+                "sent_at": now,  # Set sent_at when inserting
+                "created_at": now
             }
             
-            result = await self.client.table('sent_emails').insert(data).execute()
-            logger.info(f"Email record inserted for user {user_id}")
+            result = await execute_query(self.client.table('sent_emails').insert(data))
+            logger.info("Email record inserted for user %s", user_id)
             return result.data[0]
             
         except Exception as e:
-            logger.error(f"Error inserting sent email: {str(e)}")
+            logger.error("Error inserting sent email: %s", e)
             raise
 
     async def get_user_sent_emails(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all emails sent to a specific user"""
         try:
-            result = await self.client.table('sent_emails')\
-                .select("*")\
-                .eq("user_id", user_id)\
-                .order("created_at", desc=True)\
-                .execute()
+            result = await execute_query(
+                self.client.table('sent_emails')
+                .select("*")
+                .eq("user_id", user_id)
+                .order("created_at", desc=True)
+            )
             return result.data
         except Exception as e:
-            logger.error(f"Error fetching sent emails: {str(e)}")
+            logger.error("Error fetching sent emails: %s", e)
             raise
 
     async def insert_question(self, user_id: str, question: str) -> Dict[str, Any]:
@@ -124,12 +187,12 @@ class SupabaseManager:
                 "created_at": datetime.utcnow().isoformat()
             }
             
-            result = await self.client.table('questions').insert(data).execute()
-            logger.info(f"Question inserted for user {user_id}")
+            result = await execute_query(self.client.table('questions').insert(data))
+            logger.info("Question inserted for user %s", user_id)
             return result.data[0]
             
         except Exception as e:
-            logger.error(f"Error inserting question: {str(e)}")
+            logger.error("Error inserting question: %s", e)
             raise
 
     async def update_linkedin_verification(self, user_id: str, verified: bool = True) -> Dict[str, Any]:
@@ -140,29 +203,31 @@ class SupabaseManager:
                 "verified_at": datetime.utcnow().isoformat() if verified else None
             }
             
-            result = await self.client.table('linkedin_verifications')\
-                .update(data)\
-                .eq("user_id", user_id)\
-                .execute()
+            result = await execute_query(
+                self.client.table('linkedin_verifications')
+                .update(data)
+                .eq("user_id", user_id)
+            )
                 
-            logger.info(f"LinkedIn verification updated for user {user_id}")
+            logger.info("LinkedIn verification updated for user %s", user_id)
             return result.data[0]
             
         except Exception as e:
-            logger.error(f"Error updating LinkedIn verification: {str(e)}")
+            logger.error("Error updating LinkedIn verification: %s", e)
             raise
 
     async def get_linkedin_verification(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get LinkedIn verification status for a user"""
         try:
-            result = await self.client.table('linkedin_verifications')\
-                .select("*")\
-                .eq("user_id", user_id)\
-                .single()\
-                .execute()
+            result = await execute_query(
+                self.client.table('linkedin_verifications')
+                .select("*")
+                .eq("user_id", user_id)
+                .single()
+            )
             return result.data
         except Exception as e:
-            logger.error(f"Error fetching LinkedIn verification: {str(e)}")
+            logger.error("Error fetching LinkedIn verification: %s", e)
             return None
 
 # Initialize the Supabase manager
@@ -175,5 +240,5 @@ async def ensure_database_setup():
         await supabase_manager.initialize_tables()
         logger.info("Database setup completed successfully")
     except Exception as e:
-        logger.error(f"Database setup failed: {str(e)}")
+        logger.error("Database setup failed: %s", e)
         raise
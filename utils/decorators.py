@@ -1,17 +1,26 @@
+import asyncio
+import logging
 from functools import wraps
+from weakref import WeakValueDictionary
 from telegram import Update
 from telegram.ext import ContextTypes
 from config import ADMIN_USER_IDS
 
+logger = logging.getLogger(__name__)
+
 def admin_only(func):
-    """Decorator to restrict commands to admin users only"""
+    """Decorator to restrict commands to admin users only
+
+    Works for both handler functions and handler methods: the update is
+    always the second-to-last positional argument.
+    """
     @wraps(func)
-    async def wrapped(self, update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
-        user_id = update.effective_user.id
-        if user_id not in ADMIN_USER_IDS:
-            await update.message.reply_text("🚫 You are not authorized to use this command.")
+    async def wrapped(*args, **kwargs):
+        update: Update = args[-2]
+        if update.effective_user.id not in ADMIN_USER_IDS:
+            await update.message.reply_text('❌ Cette commande est réservée aux administrateurs.')
             return
-        return await func(self, update, context, *args, **kwargs)
+        return await func(*args, **kwargs)
     return wrapped
 
 def private_chat_only(func):
@@ -23,3 +32,56 @@ def private_chat_only(func):
         else:
             await update.message.reply_text('❌ Cette commande fonctionne uniquement dans un chat privé.')
     return wrapped
+
+# One lock per key (a user ID, a normalized email address, ...); entries
+# disappear once no handler holds or awaits them
+_locks = WeakValueDictionary()
+
+def key_lock(key) -> asyncio.Lock:
+    """Return the lock shared by every handler serializing on key"""
+    lock = _locks.get(key)
+    if lock is None:
+        lock = _locks[key] = asyncio.Lock()
+    return lock
+
+def per_user_serialized(func):
+    """Decorator to run a handler at most once at a time per user
+
+    With concurrent updates enabled, different users are handled in
+    parallel while repeated commands from the same user keep their order.
+    """
+    @wraps(func)
+    async def wrapped(*args, **kwargs):
+        update: Update = args[-2]
+        async with key_lock(update.effective_user.id):
+            return await func(*args, **kwargs)
+    return wrapped
+
+async def handle_error_with_retry(update: Update, message: str, max_retries: int = 3) -> None:
+    """Handle errors with retry logic"""
+    for attempt in range(max_retries):
+        try:
+            await update.message.reply_text(f'❌ {message}')
+            break
+        except Exception as e:
+            if attempt == max_retries - 1:
+                logger.error("Failed to send error message after %d attempts: %s", max_retries, e, exc_info=True)
+            else:
+                await asyncio.sleep(1)  # Wait before retry
+
+def handle_errors(message: str):
+    """Decorator to log a handler's unexpected errors and report them to the user
+
+    Replaces the try/except block each handler used to repeat; `message` is
+    the text sent back (with retries) when the handler raises.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapped(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                logger.error("Error in %s: %s", func.__name__, e, exc_info=True)
+                await handle_error_with_retry(args[-2], message)
+        return wrapped
+    return decorator
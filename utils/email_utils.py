@@ -1,4 +1,7 @@
+import asyncio
 import smtplib
+import time
+from collections import OrderedDict
 from email.mime.multipart import MIMEMultipart
 from telegram.ext import ContextTypes
 
@@ -8,36 +11,109 @@ from typing import Dict, Any
 from datetime import datetime
 import logging
 import motor.motor_asyncio
+from utils.decorators import key_lock
 from config import (
     EMAIL_ADDRESS,
     EMAIL_PASSWORD,
     SMTP_SERVER,
     SMTP_PORT,
     CV_FILES,
+    CV_TYPES,
     ADMIN_USER_IDS,
-    MONGODB_URI
+    MONGODB_URI,
+    PREVIOUS_SENDS_CACHE_TTL,
+    PREVIOUS_SENDS_CACHE_SIZE,
 )
 
 logger = logging.getLogger(__name__)
 
-# Initialize MongoDB client
-client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
-db = client.cvbot
-sent_emails_collection = db.sent_emails
+# MongoDB collection, created on first use rather than at import
+_sent_emails_collection = None
+
+def get_sent_emails_collection():
+    """Return the sent_emails collection, creating the client on first use"""
+    global _sent_emails_collection
+    if _sent_emails_collection is None:
+        client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
+        _sent_emails_collection = client.cvbot.sent_emails
+    return _sent_emails_collection
+
+# Reply texts; only the CV type and address change between sends
+_SUCCESS_TEXT = (
+    '✅ Le CV de type {cv_label} a été envoyé à {email}. ✉️\n\n'
+    'سعداء جدا باهتمامكم بمبادرة CV_UP ! 🌟\n\n'
+    'لقد تحصلتم على نسخة من مودال CV_UP التي ستساعدكم في تفادي أغلب الأخطاء التي قد تحرمكم من فرص العمل. 📝\n\n'
+    'بقي الآن تعديلها وفقًا لمعلوماتكم. ✍️\n\n'
+    '📄 ملاحظة: لا تنسوا دفع ثمن السيرة الذاتية إما بالتبرع بالدم في إحدى المستشفيات 🩸 أو التبرع بمبلغ من المال إلى جمعية البركة الجزائرية 💵، الذين بدورهم يوصلون التبرعات إلى غزة. 🙏\n\n'
+    ' نرجو منكم تأكيد تسديد ثمن النسخة والذي كان التبرع بالدم في أحد المستشفيات أو التبرع لغزة عن طريق جمعية البركة. على الحساب   التالي CCP. 210 243 29 Clé 40 🏥✊'
+)
+_PREVIOUS_SEND_TEXT = '📩 Vous avez déjà reçu un CV de type {}.'
+_INVALID_TYPE_TEXT = '❌ Type de CV incorrect. Veuillez utiliser "junior" ou "senior".'
+
+# ('email', address) / ('user', user_id) -> (CV type already sent, cached at),
+# oldest first. Repeat /sendcv attempts skip the database; entries expire so
+# a record deleted to allow a resend stops blocking within the TTL.
+_previous_sends = OrderedDict()
+
+def _get_previous_send(key):
+    """Return the cached CV type for key, dropping it once expired"""
+    entry = _previous_sends.get(key)
+    if entry is None:
+        return None
+    cv_type, cached_at = entry
+    if time.monotonic() - cached_at >= PREVIOUS_SENDS_CACHE_TTL:
+        del _previous_sends[key]
+        return None
+    _previous_sends.move_to_end(key)
+    return cv_type
+
+def _remember_previous_send(key, cv_type):
+    """Cache a known send, evicting the least recently used entry when full"""
+    _previous_sends[key] = (cv_type, time.monotonic())
+    _previous_sends.move_to_end(key)
+    if len(_previous_sends) > PREVIOUS_SENDS_CACHE_SIZE:
+        _previous_sends.popitem(last=False)
+
+# Duplicate checks only need the CV type, plus the two keys to tell which
+# one matched; skip the rest of the document
+_PREVIOUS_SEND_FIELDS = {"cv_type": 1, "email": 1, "user_id": 1, "_id": 0}
 
 async def check_previous_sends(email: str, user_id: int):
-    """Check if email or user has previously received a CV"""
-    # Check if email has already received a CV
-    email_record = await sent_emails_collection.find_one({"email": email})
-    if email_record:
-        return f'📩 Vous avez déjà reçu un CV de type {email_record["cv_type"]}.'
-    
-    # Check if user has already received a CV
-    user_record = await sent_emails_collection.find_one({"user_id": str(user_id)})
-    if user_record:
-        return f'📩 Vous avez déjà reçu un CV de type {user_record["cv_type"]}.'
-    
-    return None
+    """Check if email or user has previously received a CV
+
+    Records store user_id as a string, so int IDs are converted before lookup.
+    """
+    user_id = str(user_id)
+    cached_type = _get_previous_send(('email', email)) or _get_previous_send(('user', user_id))
+    if cached_type:
+        return _PREVIOUS_SEND_TEXT.format(cached_type)
+
+    # One round trip for both checks: has this email or this user received a CV?
+    record = await get_sent_emails_collection().find_one(
+        {"$or": [{"email": email}, {"user_id": user_id}]},
+        _PREVIOUS_SEND_FIELDS,
+    )
+    if not record:
+        return None
+
+    # Cache only the key(s) the record actually matched
+    if record.get("email") == email:
+        _remember_previous_send(('email', email), record["cv_type"])
+    if record.get("user_id") == user_id:
+        _remember_previous_send(('user', user_id), record["cv_type"])
+    return _PREVIOUS_SEND_TEXT.format(record["cv_type"])
+
+def _read_cv_file(cv_type: str) -> bytes:
+    """Read the CV attachment from disk"""
+    with open(CV_FILES[cv_type], 'rb') as file:
+        return file.read()
+
+def _deliver_email(email: str, message: str) -> None:
+    """Send a prepared message over SMTP"""
+    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
+        server.starttls()
+        server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
+        server.sendmail(EMAIL_ADDRESS, email, message)
 
 async def send_email_with_cv(email: str, cv_type: str, user_id: int, context: ContextTypes.DEFAULT_TYPE) -> str:
     """
@@ -52,11 +128,23 @@ async def send_email_with_cv(email: str, cv_type: str, user_id: int, context: Co
     Returns:
         str: Success or error message
     """
-    if cv_type.lower() not in CV_FILES:
-        return '❌ Type de CV incorrect. Veuillez utiliser "junior" ou "senior".'
+    if cv_type not in CV_TYPES:
+        cv_type = cv_type.lower()
+    if cv_type not in CV_TYPES:
+        return _INVALID_TYPE_TEXT
     
     is_admin = user_id in ADMIN_USER_IDS
-    
+    if is_admin:
+        return await _send_cv(email, cv_type, user_id, is_admin)
+
+    # Updates run concurrently, and the per-user lock on /sendcv doesn't stop
+    # two users from claiming the same address at once: serialize the
+    # check-then-send on the address itself
+    async with key_lock(('email', email)):
+        return await _send_cv(email, cv_type, user_id, is_admin)
+
+async def _send_cv(email: str, cv_type: str, user_id: int, is_admin: bool) -> str:
+    """Check previous sends, then send the CV and record it"""
     try:
         # Check previous sends for non-admin users
         if not is_admin:
@@ -70,55 +158,48 @@ async def send_email_with_cv(email: str, cv_type: str, user_id: int, context: Co
         msg['To'] = email
         msg['Subject'] = f'{cv_type.capitalize()} CV'
         
+        # File and SMTP I/O block, so keep them off the event loop
         part = MIMEBase('application', 'octet-stream')
-        with open(CV_FILES[cv_type.lower()], 'rb') as file:
-            part.set_payload(file.read())
+        part.set_payload(await asyncio.to_thread(_read_cv_file, cv_type))
         encoders.encode_base64(part)
         part.add_header('Content-Disposition', f'attachment; filename={cv_type}_cv.docx')
         msg.attach(part)
         
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-            server.sendmail(EMAIL_ADDRESS, email, msg.as_string())
+        await asyncio.to_thread(_deliver_email, email, msg.as_string())
         
         # Record sent email for non-admin users
         if not is_admin:
-            await sent_emails_collection.insert_one({
+            await get_sent_emails_collection().insert_one({
                 "email": email,
                 "cv_type": cv_type,
                 "user_id": str(user_id),
                 "sent_at": datetime.utcnow()
             })
+            _remember_previous_send(('email', email), cv_type)
+            _remember_previous_send(('user', str(user_id)), cv_type)
         
-        return (
-            f'✅ Le CV de type {cv_type.capitalize()} a été envoyé à {email}. ✉️\n\n'
-            'سعداء جدا باهتمامكم بمبادرة CV_UP ! 🌟\n\n'
-            'لقد تحصلتم على نسخة من مودال CV_UP التي ستساعدكم في تفادي أغلب الأخطاء التي قد تحرمكم من فرص العمل. 📝\n\n'
-            'بقي الآن تعديلها وفقًا لمعلوماتكم. ✍️\n\n'
-            '📄 ملاحظة: لا تنسوا دفع ثمن السيرة الذاتية إما بالتبرع بالدم في إحدى المستشفيات 🩸 أو التبرع بمبلغ من المال إلى جمعية البركة الجزائرية 💵، الذين بدورهم يوصلون التبرعات إلى غزة. 🙏\n\n'
-            ' نرجو منكم تأكيد تسديد ثمن النسخة والذي كان التبرع بالدم في أحد المستشفيات أو التبرع لغزة عن طريق جمعية البركة. على الحساب   التالي CCP. 210 243 29 Clé 40 🏥✊'
-        )
+        return _SUCCESS_TEXT.format(cv_label=cv_type.capitalize(), email=email)
         
     except FileNotFoundError:
-        logger.error(f"CV file not found for type: {cv_type}")
+        logger.error("CV file not found for type: %s", cv_type)
         return f'❌ Erreur: Le fichier CV de type {cv_type} n\'a pas été trouvé'
         
     except smtplib.SMTPException as e:
-        logger.error(f"SMTP error sending email: {str(e)}")
+        logger.error("SMTP error sending email: %s", e)
         return f'❌ Erreur lors de l\'envoi de l\'e-mail: Problème de serveur SMTP'
         
     except Exception as e:
-        logger.error(f"Unexpected error sending email: {str(e)}")
+        logger.error("Unexpected error sending email: %s", e)
         return f'❌ Une erreur inattendue s\'est produite lors de l\'envoi de l\'e-mail'
 
 # Example function to get statistics (optional)
 async def get_sent_email_stats():
     """Get statistics about sent emails"""
     try:
-        total_sent = await sent_emails_collection.count_documents({})
-        junior_sent = await sent_emails_collection.count_documents({"cv_type": "junior"})
-        senior_sent = await sent_emails_collection.count_documents({"cv_type": "senior"})
+        collection = get_sent_emails_collection()
+        total_sent = await collection.count_documents({})
+        junior_sent = await collection.count_documents({"cv_type": "junior"})
+        senior_sent = await collection.count_documents({"cv_type": "senior"})
         
         return {
             "total_sent": total_sent,
@@ -126,5 +207,5 @@ async def get_sent_email_stats():
             "senior_sent": senior_sent
         }
     except Exception as e:
-        logger.error(f"Error getting email stats: {str(e)}")
+        logger.error("Error getting email stats: %s", e)
         return None
@@ -1,7 +1,10 @@
+import asyncio
 import logging
+import os
 import sys
-import json
-from supabase_config import supabase_manager  # Updated import
+import tempfile
+import orjson
+from supabase_config import supabase_manager, execute_query
 from config import (
     QUESTIONS_TABLE,
     SENT_EMAILS_TABLE,
@@ -14,95 +17,110 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
+def replace_file(path, data: bytes) -> None:
+    """Atomically replace a file's contents (blocking, call through asyncio.to_thread)
+
+    The payload goes to a temporary file in a single write and is then
+    renamed over the target, so a crash never leaves a half-written file.
+    Each call gets its own temporary file, so concurrent writers to the same
+    target cannot truncate or rename each other's data.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as output_file:
+            output_file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
 async def check_supabase_connection():
     try:
         client = supabase_manager.client  # Use client from manager
-        await client.table(SENT_EMAILS_TABLE).select("id").limit(1).execute()
-        await client.table(QUESTIONS_TABLE).select("id").limit(1).execute()
+        await execute_query(client.table(SENT_EMAILS_TABLE).select("id").limit(1))
+        await execute_query(client.table(QUESTIONS_TABLE).select("id").limit(1))
         logger.info("Supabase connection successful")
     except Exception as e:
-        logger.error(f"Failed to connect to Supabase: {str(e)}", exc_info=True)
+        logger.error("Failed to connect to Supabase: %s", e, exc_info=True)
         sys.exit(1)
 
 async def load_questions():
     try:
-        response = await supabase_manager.client.table(QUESTIONS_TABLE).select('*').execute()
+        response = await execute_query(supabase_manager.client.table(QUESTIONS_TABLE).select('*'))
         questions = {str(item['id']): item for item in response.data}
         next_id = max(map(int, questions.keys()), default=0) + 1
         return questions, next_id
     except Exception as e:
-        logger.error(f"Error loading questions from Supabase: {str(e)}")
+        logger.error("Error loading questions from Supabase: %s", e)
         return {}, 1
 
 async def save_questions(questions):
     try:
         # Save to JSON first
-        with open(QUESTIONS_FILE, 'w') as json_file:
-            json.dump(questions, json_file)
+        await asyncio.to_thread(replace_file, QUESTIONS_FILE, orjson.dumps(questions))
 
         # Then save to Supabase
         for question_id, question_data in questions.items():
-            await supabase_manager.client.table(QUESTIONS_TABLE).upsert(question_data).execute()
+            await execute_query(supabase_manager.client.table(QUESTIONS_TABLE).upsert(question_data))
     except Exception as e:
-        logger.error(f"Error saving questions to Supabase: {str(e)}")
+        logger.error("Error saving questions to Supabase: %s", e)
 
 async def load_sent_emails():
     try:
-        response = await supabase_manager.client.table(SENT_EMAILS_TABLE).select('*').execute()
+        response = await execute_query(supabase_manager.client.table(SENT_EMAILS_TABLE).select('*'))
         return {str(item['id']): item for item in response.data}
     except Exception as e:
-        logger.error(f"Error loading sent emails from Supabase: {str(e)}")
+        logger.error("Error loading sent emails from Supabase: %s", e)
         return {}
 
 async def save_sent_emails(sent_emails):
     try:
         for email_id, email_data in sent_emails.items():
-            await supabase_manager.client.table(SENT_EMAILS_TABLE).upsert(email_data).execute()
+            await execute_query(supabase_manager.client.table(SENT_EMAILS_TABLE).upsert(email_data))
     except Exception as e:
-        logger.error(f"Error saving sent emails to Supabase: {str(e)}")
+        logger.error("Error saving sent emails to Supabase: %s", e)
 
 async def load_scraped_data():
     try:
-        response = await supabase_manager.client.table(SCRAPED_DATA_TABLE).select('*').execute()
+        response = await execute_query(supabase_manager.client.table(SCRAPED_DATA_TABLE).select('*'))
         return [item['data'] for item in response.data]
     except Exception as e:
-        logger.error(f"Error loading scraped data from Supabase: {str(e)}")
+        logger.error("Error loading scraped data from Supabase: %s", e)
         return []
 
 async def save_scraped_data(scraped_data):
     try:
         # Save to JSON first
-        with open(SCRAPED_DATA_FILE, 'w') as json_file:
-            json.dump(scraped_data, json_file)
+        await asyncio.to_thread(replace_file, SCRAPED_DATA_FILE, orjson.dumps(scraped_data))
 
         # Then save to Supabase
         for data in scraped_data:
-            await supabase_manager.client.table(SCRAPED_DATA_TABLE).insert({'data': data}).execute()
+            await execute_query(supabase_manager.client.table(SCRAPED_DATA_TABLE).insert({'data': data}))
     except Exception as e:
-        logger.error(f"Error saving scraped data to Supabase: {str(e)}")
+        logger.error("Error saving scraped data to Supabase: %s", e)
 
 async def track_user(user_id, chat_id):
     try:
-        await supabase_manager.client.table(USERS_TABLE).upsert({
+        await execute_query(supabase_manager.client.table(USERS_TABLE).upsert({
             'user_id': user_id,
             'chat_id': chat_id,
             'last_active': 'now()'
-        }).execute()
-        logger.info(f"Tracked user {user_id} in chat {chat_id}")
+        }))
+        logger.debug("Tracked user %s in chat %s", user_id, chat_id)
     except Exception as e:
-        logger.error(f"Error tracking user in Supabase: {str(e)}")
+        logger.error("Error tracking user in Supabase: %s", e)
 
 # Helper functions for Supabase operations
 async def load_json_file(table_name):
     try:
-        response = await supabase_manager.client.table(table_name).select('*').execute()
+        response = await execute_query(supabase_manager.client.table(table_name).select('*'))
         return {str(item['id']): item for item in response.data}
     except Exception as e:
-        logger.error(f"Error loading data from Supabase table {table_name}: {str(e)}")
+        logger.error("Error loading data from Supabase table %s: %s", table_name, e)
         return {}
 
 async def save_json_file(table_name, data):
     try:
-        await supabase_manager.client.table(table_name).upsert(data).execute()
+        await execute_query(supabase_manager.client.table(table_name).upsert(data))
     except Exception as e:
-        logger.error(f"Error saving data to Supabase table {table_name}: {str(e)}")
+        logger.error("Error saving data to Supabase table %s: %s", table_name, e)
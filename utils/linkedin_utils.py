@@ -1,19 +1,32 @@
 # linkedin_utils.py
 
-import json
-import redis
-from config import REDIS_URL
+import orjson
+from redis import asyncio as aioredis
+from config import (
+    REDIS_URL,
+    REDIS_MAX_CONNECTIONS,
+    REDIS_POOL_TIMEOUT,
+    REDIS_VERIFIED_KEY_PREFIX,
+)
 
-redis_client = redis.from_url(REDIS_URL)
+# Async client so lookups from bot handlers don't block the event loop,
+# backed by one bounded pool shared by all concurrent handlers. Replies are
+# decoded to str once, in the connection.
+redis_pool = aioredis.BlockingConnectionPool.from_url(
+    REDIS_URL,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=REDIS_POOL_TIMEOUT,
+    decode_responses=True,
+)
+redis_client = aioredis.Redis(connection_pool=redis_pool)
 
-def is_linkedin_verified(user_id):
+async def is_linkedin_verified(user_id):
     """Check if a user has completed LinkedIn verification."""
-    verified_data = redis_client.get(f"linkedin_verified:{user_id}")
-    return bool(verified_data)
+    return bool(await redis_client.exists(f"{REDIS_VERIFIED_KEY_PREFIX}{user_id}"))
 
-def get_linkedin_profile(user_id):
+async def get_linkedin_profile(user_id):
     """Get the LinkedIn profile data for a verified user."""
-    verified_data = redis_client.get(f"linkedin_verified:{user_id}")
+    verified_data = await redis_client.get(f"{REDIS_VERIFIED_KEY_PREFIX}{user_id}")
     if verified_data:
-        return json.loads(verified_data)
+        return orjson.loads(verified_data)
     return None
@@ -0,0 +1,20 @@
+from telegram.constants import MessageLimit
+
+def split_message(text):
+    """Split text into pieces that each fit Telegram's text length limit"""
+    limit = MessageLimit.MAX_TEXT_LENGTH
+    return [text[i:i + limit] for i in range(0, len(text), limit)] or [text]
+
+def pack_messages(parts, separator='\n'):
+    """Join parts into as few messages as fit Telegram's text length limit"""
+    limit = MessageLimit.MAX_TEXT_LENGTH
+    chunk, size = [], 0
+    for part in parts:
+        for piece in split_message(part):
+            if chunk and size + len(separator) + len(piece) > limit:
+                yield separator.join(chunk)
+                chunk, size = [], 0
+            size += len(piece) + (len(separator) if chunk else 0)
+            chunk.append(piece)
+    if chunk:
+        yield separator.join(chunk)
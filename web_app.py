@@ -2,16 +2,28 @@
 
 from flask import Flask, request, redirect, url_for
 import requests
-import json
+import orjson
 from config import LINKEDIN_CLIENT_ID, LINKEDIN_CLIENT_SECRET, LINKEDIN_REDIRECT_URI, LINKEDIN_SCOPE
 import redis
 from telegram import Bot
-from config import BOT_TOKEN, REDIS_URL, WEBHOOK_URL
+from config import BOT_TOKEN, REDIS_URL, WEBHOOK_URL, API_TIMEOUT_SECONDS, REDIS_MAX_CONNECTIONS, REDIS_POOL_TIMEOUT
+from config import REDIS_VERIFIED_KEY_PREFIX
 
 app = Flask(__name__)
-redis_client = redis.from_url(REDIS_URL)
+# One bounded pool shared by all request threads; when it is exhausted a
+# request waits for a free connection instead of opening another one
+redis_pool = redis.BlockingConnectionPool.from_url(
+    REDIS_URL,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=REDIS_POOL_TIMEOUT,
+    decode_responses=True,
+)
+redis_client = redis.Redis(connection_pool=redis_pool)
 bot = Bot(token=BOT_TOKEN)
 
+# Shared session so LinkedIn calls reuse pooled keep-alive connections
+http_session = requests.Session()
+
 @app.route('/start-linkedin-auth/<int:user_id>')
 def start_linkedin_auth(user_id):
     auth_url = f"https://www.linkedin.com/oauth/v2/authorization?response_type=code&client_id={LINKEDIN_CLIENT_ID}&redirect_uri={LINKEDIN_REDIRECT_URI}&state={user_id}&scope={LINKEDIN_SCOPE}"
@@ -31,17 +43,17 @@ def linkedin_callback():
         'client_id': LINKEDIN_CLIENT_ID,
         'client_secret': LINKEDIN_CLIENT_SECRET
     }
-    response = requests.post(token_url, data=data)
+    response = http_session.post(token_url, data=data, timeout=API_TIMEOUT_SECONDS)
     access_token = response.json().get('access_token')
     
     # Get user profile
     profile_url = 'https://api.linkedin.com/v2/me'
     headers = {'Authorization': f'Bearer {access_token}'}
-    profile_response = requests.get(profile_url, headers=headers)
+    profile_response = http_session.get(profile_url, headers=headers, timeout=API_TIMEOUT_SECONDS)
     profile = profile_response.json()
     
     # Store verification in Redis
-    redis_client.set(f"linkedin_verified:{state}", json.dumps(profile))
+    redis_client.set(f"{REDIS_VERIFIED_KEY_PREFIX}{state}", orjson.dumps(profile))
     
     # Notify user via Telegram
     bot.send_message(chat_id=state, text="LinkedIn verification successful! You can now use all bot features.")